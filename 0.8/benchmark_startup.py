@@ -0,0 +1,127 @@
+"""Measure import time and startup time of the game engine module.
+
+Usage:
+    python benchmark_startup.py [--runs N] [--entities N]
+
+Every measurement runs in a fresh interpreter so module caches do not hide the cost.
+The scene tool workloads load a scene file and save it again, the way command-line
+tools and server workers use the engine: once through the plain-data functions
+(load_scene_data/save_scene_data) and once through a headless GameEngine, which
+builds real Ursina entities in a windowless app. The eager baseline reproduces the old startup
+path: `from ursina import *` at import, an Ursina app and every subsystem built in the
+constructor. Apps are created without a window so both paths can run on servers.
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ENGINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game-engine-08.py')
+
+LOAD_ENGINE = f"""
+spec = importlib.util.spec_from_file_location('game_engine', {ENGINE_PATH!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+SUBSYSTEMS = ['audio_system', 'ai_system', 'resource_manager', 'physics_system', 'graphics_system', 'light_system']
+
+MAKE_SCENE = f"""
+import importlib.util, sys
+{LOAD_ENGINE}
+engine = module.GameEngine(headless=True)
+for chain in range(max(1, int(sys.argv[2]) // 5)):
+    parent = engine.create_entity('cube', position=(chain,0,0))
+    for depth in range(4):
+        child = engine.create_entity('sphere', position=(0,1,0))
+        engine.physics_system.set_parent(child, parent)
+        parent = child
+engine.save_scene_to_file(sys.argv[1])
+"""
+
+BENCHMARKS = {
+    'engine import': f"""
+import importlib.util, time
+start = time.perf_counter()
+{LOAD_ENGINE}
+print(time.perf_counter() - start)
+""",
+    'ursina import': """
+import time
+start = time.perf_counter()
+from ursina import *
+from ursina.prefabs.first_person_controller import FirstPersonController
+print(time.perf_counter() - start)
+""",
+    'scene data tool': f"""
+import importlib.util, sys, time
+start = time.perf_counter()
+{LOAD_ENGINE}
+module.save_scene_data(sys.argv[2], module.load_scene_data(sys.argv[1]))
+print(time.perf_counter() - start)
+""",
+    'scene tool': f"""
+import importlib.util, sys, time
+start = time.perf_counter()
+{LOAD_ENGINE}
+engine = module.GameEngine(headless=True)
+engine.load_scene_from_file(sys.argv[1])
+engine.save_scene_to_file(sys.argv[2])
+print(time.perf_counter() - start)
+""",
+    'eager scene tool': f"""
+import importlib.util, sys, time
+start = time.perf_counter()
+from ursina import *
+from ursina.prefabs.first_person_controller import FirstPersonController
+{LOAD_ENGINE}
+engine = module.GameEngine(headless=True)
+engine.init_engine()
+for name in {SUBSYSTEMS!r}:
+    getattr(engine, name)
+engine.load_scene_from_file(sys.argv[1])
+engine.save_scene_to_file(sys.argv[2])
+print(time.perf_counter() - start)
+""",
+}
+
+
+def time_in_subprocess(code, runs, *args):
+    """Median seconds reported by `code` over several fresh interpreters"""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code, *args], capture_output=True, text=True, check=True)
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--entities', type=int, default=100)
+    args = parser.parse_args()
+
+    if importlib.util.find_spec('ursina') is None:
+        print(f"{'engine import:':20} {time_in_subprocess(BENCHMARKS['engine import'], args.runs) * 1000:9.2f} ms")
+        print("ursina is not installed, skipping the Ursina and scene tool benchmarks")
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        scene_file = os.path.join(folder, 'scene.json')
+        output_file = os.path.join(folder, 'out.json')
+        subprocess.run([sys.executable, '-c', MAKE_SCENE, scene_file, str(args.entities)], capture_output=True, check=True)
+
+        results = {}
+        for name, code in BENCHMARKS.items():
+            results[name] = time_in_subprocess(code, args.runs, scene_file, output_file)
+            print(f"{name + ':':20} {results[name] * 1000:9.2f} ms")
+
+    for new, old in (('engine import', 'ursina import'), ('scene data tool', 'eager scene tool'), ('scene tool', 'eager scene tool')):
+        print(f"{new} / {old}: {results[new] / results[old]:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,420 @@
-from ursina import *
-from ursina.prefabs.first_person_controller import FirstPersonController
 import json
+import math
+import uuid
 
-class GameEngine:
-    def __init__(self):
-        self.app = None
-        self.entities = []
-        self.scenes = {}
-        self.current_scene = None
-        self.init_engine()
+# Ursina (and Panda3D behind it) is imported inside the functions that need it, so
+# tools that only touch scene files or engine data do not pay for it at import time.
+_ursina_module = None
+
+
+def _ursina():
+    """Import Ursina once and keep it for code that runs every frame"""
+    global _ursina_module
+    if _ursina_module is None:
+        import ursina
+        _ursina_module = ursina
+    return _ursina_module
+
+
+def load_scene_data(filename):
+    """Read a scene file as plain entity states, without creating Ursina entities"""
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+
+def save_scene_data(filename, scene_data):
+    """Write plain entity states (as produced by load_scene_data) to a scene file"""
+    with open(filename, 'w') as f:
+        json.dump(scene_data, f)
+
+
+class LazySubsystem:
+    """Build an engine subsystem on first access instead of in __init__
+
+    factory is called with the engine instance, so subsystems can be wired together.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        subsystem = self.factory(instance)
+        # Store on the instance so later lookups skip the descriptor entirely
+        instance.__dict__[self.name] = subsystem
+        return subsystem
+
+
+def _compose_local(position, rotation, scale):
+    """Build a local affine transform (3x3 matrix, translation) from position/rotation/scale.
+
+    Rotation follows Ursina's order: roll (z), then pitch (x), then yaw (y), in degrees.
+    Positive angles are clockwise when looking along the axis, as in Ursina: yaw 90 turns
+    forward (0,0,1) to +x, pitch 90 turns it to -y, roll 90 turns up (0,1,0) to +x.
+    """
+    rx, ry, rz = (math.radians(a) for a in rotation)
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    yaw = ((cy, 0, sy), (0, 1, 0), (-sy, 0, cy))
+    pitch = ((1, 0, 0), (0, cx, -sx), (0, sx, cx))
+    roll = ((cz, sz, 0), (-sz, cz, 0), (0, 0, 1))
+    r = _mat_mul(_mat_mul(yaw, pitch), roll)
+    sx_, sy_, sz_ = scale
+    m = tuple((row[0]*sx_, row[1]*sy_, row[2]*sz_) for row in r)
+    return m, tuple(position)
+
+
+def _read_local(entity):
+    return tuple(entity.position), tuple(entity.rotation), tuple(entity.scale)
+
+
+def _is_removed(entity):
+    # Entities destroyed by Ursina keep their Python object but lose their NodePath
+    is_empty = getattr(entity, 'is_empty', None)
+    return is_empty is not None and is_empty()
+
+
+# Ursina properties and methods that change an entity's local transform or parent
+_TRANSFORM_SETTERS = (
+    'position', 'x', 'y', 'z', 'world_position', 'world_x', 'world_y', 'world_z',
+    'rotation', 'rotation_x', 'rotation_y', 'rotation_z',
+    'world_rotation', 'world_rotation_x', 'world_rotation_y', 'world_rotation_z', 'quaternion',
+    'scale', 'scale_x', 'scale_y', 'scale_z',
+    'world_scale', 'world_scale_x', 'world_scale_y', 'world_scale_z',
+    'transform', 'world_transform',
+)
+_TRANSFORM_METHODS = ('set_position', 'rotate', 'look_at', 'look_at_2d', 'look_at_xy', 'look_at_xz')
+_PARENT_SETTERS = ('parent', 'world_parent')
+_watched_classes = set()
+_wrapped_members = set()
+
+
+def _notify(entity, reparented):
+    system = entity.__dict__.get('_transform_system')
+    if system is not None:
+        if reparented:
+            system._on_reparented(entity)
+        system.mark_moved(entity)
+
+
+def _watch_transform_setters(cls):
+    """Wrap the transform setters of an entity class so writes mark tracked entities as moved"""
+    if cls in _watched_classes:
+        return
+    _watched_classes.add(cls)
+    for name in _TRANSFORM_SETTERS + _PARENT_SETTERS + _TRANSFORM_METHODS:
+        owner = next((klass for klass in cls.__mro__ if name in klass.__dict__), None)
+        if owner is None or (owner, name) in _wrapped_members:
+            continue
+        member = owner.__dict__[name]
+        reparented = name in _PARENT_SETTERS
+        if isinstance(member, property) and member.fset is not None:
+            def setter(entity, value, fset=member.fset, reparented=reparented):
+                fset(entity, value)
+                _notify(entity, reparented)
+            setattr(owner, name, property(member.fget, setter, member.fdel, member.__doc__))
+        elif callable(member) and name in _TRANSFORM_METHODS:
+            def method(entity, *args, _method=member, **kwargs):
+                result = _method(entity, *args, **kwargs)
+                _notify(entity, False)
+                return result
+            setattr(owner, name, method)
+        else:
+            continue
+        _wrapped_members.add((owner, name))
 
-    def init_engine(self):
-        """Initialize the Ursina engine"""
-        self.app = Ursina()
-        
-    def create_entity(self, model_type, position=(0,0,0), scale=(1,1,1), color=color.white, texture=None):
-        """Create a new entity"""
-        entity = Entity(
-            model=model_type,
-            position=position,
-            scale=scale,
-            color=color,
-            texture=texture
-        )
-        self.entities.append(entity)
-        return entity
 
-    def create_light(self, position=(0,0,0), color=color.white, intensity=1):
-        """Create a point light"""
-        light = PointLight(
-            position=position,
-            color=color,
-            intensity=intensity
-        )
-        self.entities.append(light)
-        return light
+def _mat_mul(a, b):
+    return tuple(
+        tuple(a[i][0]*b[0][j] + a[i][1]*b[1][j] + a[i][2]*b[2][j] for j in range(3))
+        for i in range(3)
+    )
 
-    def create_camera(self, position=(0,0,0), rotation=(0,0,0)):
-        """Create a camera"""
-        camera = EditorCamera(
-            position=position,
-            rotation=rotation
-        )
-        self.entities.append(camera)
-        return camera
 
-    def create_fps_controller(self, position=(0,0,0)):
-        """Create a first person controller"""
-        player = FirstPersonController(
-            position=position
-        )
-        self.entities.append(player)
-        return player
+def _combine(parent, local):
+    """Combine a parent world transform with a child local transform"""
+    pm, pt = parent
+    lm, lt = local
+    m = _mat_mul(pm, lm)
+    t = tuple(pm[i][0]*lt[0] + pm[i][1]*lt[1] + pm[i][2]*lt[2] + pt[i] for i in range(3))
+    return m, t
 
-    def add_physics(self, entity):
-        """Add physics to an entity"""
-        if not hasattr(entity, 'rigidbody'):
-            entity.add_script(RigidBody())
 
-    def remove_physics(self, entity):
-        """Remove physics from an entity"""
-        if hasattr(entity, 'rigidbody'):
-            entity.remove_script('rigidbody')
+def _inverse(m):
+    """Inverse of a 3x3 matrix"""
+    (a, b, c), (d, e, f), (g, h, i) = m
+    det = a*(e*i - f*h) - b*(d*i - f*g) + c*(d*h - e*g)
+    return (
+        ((e*i - f*h) / det, (c*h - b*i) / det, (b*f - c*e) / det),
+        ((f*g - d*i) / det, (a*i - c*g) / det, (c*d - a*f) / det),
+        ((d*h - e*g) / det, (b*g - a*h) / det, (a*e - b*d) / det),
+    )
+
+
+class TransformSystem:
+    """Cache of world transforms for parent/child hierarchies.
+
+    Local transforms live in flat arrays sorted by depth, so parents always come
+    before their children. `update()` walks the arrays once per frame and only
+    recomputes world transforms of nodes marked dirty and their descendants.
+
+    Writes through Ursina's transform properties (`entity.position += ...`,
+    `rotation_y`, `scale`, `parent`, `look_at()`...) queue the entity as moved, and
+    `update()` re-reads only those entities. Anything that moves entities behind
+    Ursina's back (raw Panda3D calls) can use `sync()`, or the O(n) `sync_moved()`.
+    """
+    def __init__(self):
+        self.nodes = {}         # stable_id -> entity
+        self.parent_ids = {}    # stable_id -> parent stable_id (or None)
+        self._index = {}        # stable_id -> slot in the arrays below
+        self._ids = []
+        self._sources = []      # (position, rotation, scale) last read from the entity
+        self._parents = []      # slot of parent, -1 for roots
+        self._depths = []
+        self._locals = []
+        self._worlds = []
+        self._dirty = []
+        self._moved = set()     # stable_ids written since the last update
+        self._order_dirty = False
+        self._any_dirty = False
+
+    def get_stable_id(self, entity):
+        """Return the stable ID of an entity, assigning one if needed"""
+        stable_id = getattr(entity, 'stable_id', None)
+        if not stable_id:
+            stable_id = uuid.uuid4().hex
+            entity.stable_id = stable_id
+        return stable_id
+
+    def register(self, entity):
+        """Track an entity in the hierarchy"""
+        stable_id = self.get_stable_id(entity)
+        if stable_id in self.nodes:
+            return stable_id
+        self.nodes[stable_id] = entity
+        self.parent_ids[stable_id] = None
+        self._index[stable_id] = len(self._ids)
+        self._ids.append(stable_id)
+        self._sources.append(_read_local(entity))
+        self._parents.append(-1)
+        self._depths.append(0)
+        self._locals.append(_compose_local(*self._sources[-1]))
+        self._worlds.append(None)
+        self._dirty.append(True)
+        self._any_dirty = True
+        entity._transform_system = self
+        _watch_transform_setters(type(entity))
+        return stable_id
+
+    def unregister(self, entity, subtree=False):
+        """Stop tracking an entity (and its descendants if subtree); remaining children become roots"""
+        stable_id = getattr(entity, 'stable_id', None)
+        if stable_id not in self.nodes:
+            return
+        removed = {stable_id}
+        if subtree:
+            removed.update(self.get_descendant_ids(stable_id))
+        self._remove(removed)
+
+    def get_descendant_ids(self, stable_id):
+        """Stable IDs of every tracked node below stable_id"""
+        children = {}
+        for child_id, parent_id in self.parent_ids.items():
+            children.setdefault(parent_id, []).append(child_id)
+        descendants, stack = [], list(children.get(stable_id, ()))
+        while stack:
+            node_id = stack.pop()
+            descendants.append(node_id)
+            stack.extend(children.get(node_id, ()))
+        return descendants
+
+    def _remove(self, removed):
+        keep = [slot for slot, node_id in enumerate(self._ids) if node_id not in removed]
+        for name in ('_ids', '_sources', '_parents', '_depths', '_locals', '_worlds', '_dirty'):
+            array = getattr(self, name)
+            setattr(self, name, [array[slot] for slot in keep])
+        for node_id in removed:
+            entity = self.nodes.pop(node_id)
+            if entity.__dict__.get('_transform_system') is self:
+                del entity._transform_system
+            del self.parent_ids[node_id]
+        self._moved -= removed
+        self._index = {node_id: index for index, node_id in enumerate(self._ids)}
+        for child_id, parent_id in self.parent_ids.items():
+            if parent_id in removed:
+                self.parent_ids[child_id] = None
+                self._dirty[self._index[child_id]] = True
+                self._any_dirty = True
+        self._order_dirty = True
+
+    def set_parent(self, entity, parent):
+        """Attach entity to parent (None detaches it) and mark its subtree dirty"""
+        stable_id = self.register(entity)
+        parent_id = self.register(parent) if parent is not None else None
+        ancestor = parent_id
+        while ancestor is not None:
+            if ancestor == stable_id:
+                raise ValueError('set_parent would create a cycle in the hierarchy')
+            ancestor = self.parent_ids[ancestor]
+        if self.parent_ids[stable_id] != parent_id:
+            self.parent_ids[stable_id] = parent_id
+            self._order_dirty = True
+        self.mark_dirty(entity)
+
+    def _on_reparented(self, entity):
+        # Called when Ursina's parent/world_parent is assigned on a tracked entity
+        parent = entity.parent
+        self.set_parent(entity, None if parent is None or parent is _ursina().scene else parent)
+
+    def set_local_transform(self, entity, position=None, rotation=None, scale=None):
+        """Update an entity's local transform and mark its subtree dirty"""
+        if position is not None:
+            entity.position = position
+        if rotation is not None:
+            entity.rotation = rotation
+        if scale is not None:
+            entity.scale = scale
+        self.sync(entity)
+
+    def sync(self, entity):
+        """Re-read the local transform of an entity that was moved directly"""
+        slot = self._index[self.register(entity)]
+        self._sources[slot] = _read_local(entity)
+        self._locals[slot] = _compose_local(*self._sources[slot])
+        self._dirty[slot] = True
+        self._any_dirty = True
+
+    def mark_moved(self, entity):
+        """Queue an entity whose local transform was written; update() re-reads it"""
+        self._moved.add(entity.stable_id)
+        self._any_dirty = True
+
+    def sync_moved(self):
+        """Poll every tracked entity for transform changes (O(n), opt-in fallback)"""
+        entities, sources = self.nodes, self._sources
+        removed = set()
+        for slot, stable_id in enumerate(self._ids):
+            entity = entities[stable_id]
+            if _is_removed(entity):
+                removed.add(stable_id)
+                continue
+            source = _read_local(entity)
+            if source != sources[slot]:
+                sources[slot] = source
+                self._locals[slot] = _compose_local(*source)
+                self._dirty[slot] = True
+                self._any_dirty = True
+        if removed:
+            self._remove_with_descendants(removed)
+
+    def _read_moved(self):
+        moved, self._moved = self._moved, set()
+        removed = set()
+        for stable_id in moved:
+            entity = self.nodes[stable_id]
+            if _is_removed(entity):
+                removed.add(stable_id)
+                continue
+            slot = self._index[stable_id]
+            source = _read_local(entity)
+            if source != self._sources[slot]:
+                self._sources[slot] = source
+                self._locals[slot] = _compose_local(*source)
+                self._dirty[slot] = True
+        if removed:
+            self._remove_with_descendants(removed)
+
+    def _remove_with_descendants(self, removed):
+        # Ursina destroys children together with their parent
+        for stable_id in list(removed):
+            removed.update(self.get_descendant_ids(stable_id))
+        self._remove(removed)
+
+    def mark_dirty(self, entity):
+        """Flag an entity so its subtree is recomputed on the next update"""
+        self._dirty[self._index[self.register(entity)]] = True
+        self._any_dirty = True
+
+    def update(self):
+        """Recompute world transforms of dirty subtrees in one pass"""
+        if self._moved:
+            self._read_moved()
+        if self._order_dirty:
+            self._rebuild_order()
+        if not self._any_dirty:
+            return
+        parents, locals_, worlds, dirty = self._parents, self._locals, self._worlds, self._dirty
+        for slot in range(len(self._ids)):
+            parent = parents[slot]
+            if parent >= 0 and dirty[parent]:
+                dirty[slot] = True
+            if dirty[slot]:
+                worlds[slot] = locals_[slot] if parent < 0 else _combine(worlds[parent], locals_[slot])
+        # Clear flags only after the pass so children can see their parent's flag
+        for slot in range(len(dirty)):
+            dirty[slot] = False
+        self._any_dirty = False
+
+    def get_world_matrix(self, entity, refresh=True):
+        """Cached world transform as (3x3 matrix, translation)
+
+        With refresh=False pending changes are not applied, so callers inside a frame
+        (AI agents) all read the result of the last update() without forcing new passes.
+        """
+        stable_id = self.register(entity)
+        if (refresh and self._any_dirty) or self._order_dirty or self._worlds[self._index[stable_id]] is None:
+            self.update()
+        return self._worlds[self._index[stable_id]]
+
+    def get_world_position(self, entity, refresh=True):
+        """Cached world position of an entity"""
+        return _ursina().Vec3(*self.get_world_matrix(entity, refresh)[1])
+
+    def is_parented(self, entity):
+        """Whether the entity is tracked and has a tracked parent"""
+        return self.parent_ids.get(getattr(entity, 'stable_id', None)) is not None
+
+    def world_to_local_vector(self, entity, vector):
+        """Convert a world-space direction into the space of the entity's parent"""
+        parent_id = self.parent_ids.get(getattr(entity, 'stable_id', None))
+        if parent_id is None:
+            return tuple(vector)
+        m = _inverse(self.get_world_matrix(self.nodes[parent_id])[0])
+        return tuple(m[i][0]*vector[0] + m[i][1]*vector[1] + m[i][2]*vector[2] for i in range(3))
+
+    def _rebuild_order(self):
+        depths = {}
+        for stable_id in self._ids:
+            depth, ancestor = 0, self.parent_ids[stable_id]
+            while ancestor is not None:
+                depth += 1
+                ancestor = self.parent_ids[ancestor]
+            depths[stable_id] = depth
+        old_index = self._index
+        order = sorted(self._ids, key=lambda stable_id: depths[stable_id])
+        self._index = {stable_id: slot for slot, stable_id in enumerate(order)}
+        self._sources = [self._sources[old_index[stable_id]] for stable_id in order]
+        self._locals = [self._locals[old_index[stable_id]] for stable_id in order]
+        self._worlds = [self._worlds[old_index[stable_id]] for stable_id in order]
+        self._dirty = [self._dirty[old_index[stable_id]] for stable_id in order]
+        self._ids = order
+        self._depths = [depths[stable_id] for stable_id in order]
+        self._parents = [
+            self._index[self.parent_ids[stable_id]] if self.parent_ids[stable_id] is not None else -1
+            for stable_id in order
+        ]
+        self._order_dirty = False
+
 
 class AdvancedPhysics:
     def __init__(self):
         self.gravity = -9.81
         self.collision_systems = []
+        self.transform_system = TransformSystem()
     
     def add_ragdoll(self, entity):
         # نظام للتحكم في الجسم عند السقوط أو الموت
@@ -85,92 +433,9 @@ class AdvancedPhysics:
         
     def set_parent(self, entity, parent):
         """Set parent for an entity"""
-        entity.parent = parent
-
-    def create_scene(self, name):
-        """Create a new scene"""
-        self.scenes[name] = []
-        self.current_scene = name
-        return self.scenes[name]
-
-    def add_to_scene(self, scene_name, entity):
-        """Add entity to a scene"""
-        if scene_name in self.scenes:
-            self.scenes[scene_name].append(entity)
-
-    def load_scene(self, scene_name):
-        """Load a scene"""
-        if scene_name in self.scenes:
-            # Clear current entities
-            for entity in self.entities:
-                destroy(entity)
-            self.entities.clear()
-            
-            # Load scene entities
-            self.entities = self.scenes[scene_name]
-            self.current_scene = scene_name
-
-    def save_scene_to_file(self, filename):
-        """Save current scene to file"""
-        scene_data = []
-        for entity in self.entities:
-            entity_data = self._get_entity_state(entity)
-            scene_data.append(entity_data)
-        
-        with open(filename, 'w') as f:
-            json.dump(scene_data, f)
-
-    def load_scene_from_file(self, filename):
-        """Load scene from file"""
-        with open(filename, 'r') as f:
-            scene_data = json.load(f)
-        
-        # Clear existing entities
-        for entity in self.entities:
-            destroy(entity)
-        self.entities.clear()
-        
-        # Create new entities from loaded data
-        for entity_data in scene_data:
-            entity = self._create_entity_from_state(entity_data)
-            self.entities.append(entity)
-
-    def _get_entity_state(self, entity):
-        """Get entity state for saving"""
-        return {
-            'model': entity.model.name if hasattr(entity, 'model') else type(entity).__name__,
-            'position': entity.position,
-            'scale': entity.scale,
-            'color': entity.color.hex,
-            'texture': str(entity.texture) if hasattr(entity, 'texture') else None,
-            'parent': entity.parent.name if entity.parent and entity.parent != scene else None,
-            'has_physics': hasattr(entity, 'rigidbody')
-        }
-
-    def _create_entity_from_state(self, state):
-        """Create entity from saved state"""
-        if state['model'] in ['PointLight', 'EditorCamera', 'FirstPersonController']:
-            if state['model'] == 'PointLight':
-                entity = PointLight()
-            elif state['model'] == 'EditorCamera':
-                entity = EditorCamera()
-            else:
-                entity = FirstPersonController()
-        else:
-            entity = Entity(model=state['model'])
-        
-        entity.position = state['position']
-        entity.scale = state['scale']
-        entity.color = color.hex(state['color'])
-        if state['texture'] and state['texture'] != 'None':
-            entity.texture = state['texture']
-        if state['has_physics']:
-            entity.add_script(RigidBody())
-        return entity
-
-    def run(self):
-        """Run the game engine"""
-        self.app.run()
+        from ursina import scene
+        entity.parent = parent if parent is not None else scene
+        self.transform_system.set_parent(entity, parent if parent not in (None, scene) else None)
 
 
 class AdvancedGraphics:
@@ -196,6 +461,7 @@ class AudioSystem:
         
     def load_sound(self, name, path):
         """تحميل ملف صوتي"""
+        from ursina import Audio
         self.audio_sources[name] = Audio(path, loop=False, autoplay=False)
         
     def play_sound(self, name):
@@ -205,6 +471,7 @@ class AudioSystem:
             
     def play_background_music(self, path):
         """تشغيل موسيقى الخلفية"""
+        from ursina import Audio
         if self.background_music:
             self.background_music.stop()
         self.background_music = Audio(path, loop=True, autoplay=True)
@@ -217,9 +484,10 @@ class AudioSystem:
             self.background_music.stop()
 
 class AISystem:
-    def __init__(self):
+    def __init__(self, transform_system=None):
         self.agents = []
         self.navigation_mesh = None
+        self.transform_system = transform_system
         
     def create_agent(self, entity, behavior_type):
         """إنشاء عميل ذكاء اصطناعي"""
@@ -238,17 +506,38 @@ class AISystem:
         
     def update_agents(self):
         """تحديث سلوك العملاء"""
+        moved = []
         for agent in self.agents:
             if agent['behavior'] == 'follow':
-                self._update_follow_behavior(agent)
+                if self._update_follow_behavior(agent):
+                    moved.append(agent['entity'])
             elif agent['behavior'] == 'patrol':
                 self._update_patrol_behavior(agent)
+
+        # تُعلَّم الكائنات المتحركة بعد انتهاء الحلقة، فتُحسب المواقع العالمية مرة واحدة في الإطار التالي
+        if self.transform_system:
+            for entity in moved:
+                if getattr(entity, 'stable_id', None) in self.transform_system.nodes:
+                    self.transform_system.mark_moved(entity)
     
     def _update_follow_behavior(self, agent):
         if agent['target']:
-            direction = agent['target'].position - agent['entity'].position
+            ursina = _ursina()
+            direction = self._get_position(agent['target']) - self._get_position(agent['entity'])
             if direction.length() > 0.5:
-                agent['entity'].position += direction.normalized() * time.dt
+                step = direction.normalized() * ursina.time.dt
+                if self.transform_system and self.transform_system.is_parented(agent['entity']):
+                    # الخطوة محسوبة في الفضاء العالمي، فتُحوَّل إلى فضاء الأب
+                    step = ursina.Vec3(*self.transform_system.world_to_local_vector(agent['entity'], step))
+                agent['entity'].position += step
+                return True
+        return False
+
+    def _get_position(self, entity):
+        # الكائنات المرتبطة بأب تُقرأ من ذاكرة الإطار السابق، والجذور من موقعها الحالي مباشرة
+        if self.transform_system and self.transform_system.is_parented(entity):
+            return self.transform_system.get_world_position(entity, refresh=False)
+        return entity.position
                 
     def _update_patrol_behavior(self, agent):
         # تنفيذ سلوك الدورية
@@ -262,14 +551,17 @@ class ResourceManager:
         
     def load_model(self, name, path):
         """تحميل نموذج ثلاثي الأبعاد"""
+        from ursina import load_model
         self.models[name] = load_model(path)
         
     def load_texture(self, name, path):
         """تحميل قوام"""
+        from ursina import load_texture
         self.textures[name] = load_texture(path)
         
     def load_animation(self, name, path):
         """تحميل حركة"""
+        from ursina import load_animation
         self.animations[name] = load_animation(path)
         
     def get_model(self, name):
@@ -281,26 +573,6 @@ class ResourceManager:
     def get_animation(self, name):
         return self.animations.get(name)
 
-# تحديث فئة GameEngine لتضمين الأنظمة الجديدة
-class GameEngine:
-    def __init__(self):
-        self.app = None
-        self.entities = []
-        self.scenes = {}
-        self.current_scene = None
-        self.audio_system = AudioSystem()
-        self.ai_system = AISystem()
-        self.resource_manager = ResourceManager()
-        self.physics_system = AdvancedPhysics()
-        self.graphics_system = AdvancedGraphics()
-        self.init_engine()
-
-    # ... (باقي الأساليب كما هي)
-
-    def update(self):
-        """تحديث حالة المحرك"""
-        self.ai_system.update_agents()
-
 class LightSystem:
     def __init__(self):
         self.lights = []
@@ -311,11 +583,12 @@ class LightSystem:
             'color_temperature': 6500  # Kelvin
         }
 
-    def create_point_light(self, position=(0,0,0), color=color.white, **kwargs):
+    def create_point_light(self, position=(0,0,0), color=None, **kwargs):
         """إنشاء إضاءة نقطية مع خصائص متقدمة"""
+        from ursina import PointLight, color as colors
         light = PointLight(
             position=position,
-            color=color,
+            color=color if color is not None else colors.white,
             intensity=kwargs.get('intensity', 1.0),
             radius=kwargs.get('radius', 10),
             shadows=kwargs.get('shadows', True),
@@ -327,11 +600,12 @@ class LightSystem:
         self.lights.append(light)
         return light
 
-    def create_spotlight(self, position=(0,0,0), color=color.white, **kwargs):
+    def create_spotlight(self, position=(0,0,0), color=None, **kwargs):
         """إنشاء إضاءة موجهة مع خصائص متقدمة"""
+        from ursina import SpotLight, color as colors
         light = SpotLight(
             position=position,
-            color=color,
+            color=color if color is not None else colors.white,
             intensity=kwargs.get('intensity', 1.0),
             fov=kwargs.get('fov', 45),
             range=kwargs.get('range', 20),
@@ -344,11 +618,12 @@ class LightSystem:
         self.lights.append(light)
         return light
 
-    def create_directional_light(self, rotation=(45,-45,0), color=color.white, **kwargs):
+    def create_directional_light(self, rotation=(45,-45,0), color=None, **kwargs):
         """إنشاء إضاءة اتجاهية مع خصائص متقدمة"""
+        from ursina import DirectionalLight, color as colors
         light = DirectionalLight(
             rotation=rotation,
-            color=color,
+            color=color if color is not None else colors.white,
             intensity=kwargs.get('intensity', 1.0),
             shadows=kwargs.get('shadows', True),
             shadow_map_resolution=kwargs.get('shadow_resolution', 4096),
@@ -357,27 +632,109 @@ class LightSystem:
         self.lights.append(light)
         return light
 
-    def create_ambient_light(self, color=color.rgb(0.1, 0.1, 0.1), **kwargs):
+    def create_ambient_light(self, color=None, **kwargs):
         """إنشاء إضاءة محيطية"""
+        from ursina import AmbientLight, color as colors
         light = AmbientLight(
-            color=color,
+            color=color if color is not None else colors.rgb(0.1, 0.1, 0.1),
             intensity=kwargs.get('intensity', 0.1)
         )
         self.lights.append(light)
         return light
 
-# تحديث فئة GameEngine لتضمين نظام الإضاءة الجديد
 class GameEngine:
-    def __init__(self):
+    # تُنشأ الأنظمة الفرعية عند أول استخدام فقط
+    audio_system = LazySubsystem(lambda engine: AudioSystem())
+    ai_system = LazySubsystem(lambda engine: AISystem(engine.physics_system.transform_system))
+    resource_manager = LazySubsystem(lambda engine: ResourceManager())
+    physics_system = LazySubsystem(lambda engine: AdvancedPhysics())
+    graphics_system = LazySubsystem(lambda engine: AdvancedGraphics())
+    light_system = LazySubsystem(lambda engine: LightSystem())
+
+    def __init__(self, headless=False):
         self.app = None
+        self.headless = headless
         self.entities = []
         self.scenes = {}
         self.current_scene = None
-        self.light_system = LightSystem()
-        self.init_engine()
+        # الاستطلاع الدوري لكل الكائنات، فقط لمن يحرك الكائنات عبر Panda3D مباشرة
+        self.poll_transforms = False
+        # في الوضع headless لا تُفتح نافذة، ويُنشأ تطبيق Ursina بلا نافذة عند أول حاجة إليه
+        if not headless:
+            self.init_engine()
+
+    def init_engine(self):
+        """Initialize the Ursina engine"""
+        ursina = _ursina()
+        self.app = ursina.Ursina(window_type='none') if self.headless else ursina.Ursina()
+        # كائن خفي يستدعي update() مرة في كل إطار
+        self._update_driver = ursina.Entity(update=self.update, eternal=True)
+
+    def _ensure_app(self):
+        if self.app is None:
+            self.init_engine()
+        
+    def create_entity(self, model_type, position=(0,0,0), scale=(1,1,1), color=None, texture=None):
+        """Create a new entity"""
+        self._ensure_app()
+        from ursina import Entity, color as colors
+        entity = Entity(
+            model=model_type,
+            position=position,
+            scale=scale,
+            color=color if color is not None else colors.white,
+            texture=texture
+        )
+        self.entities.append(entity)
+        return entity
+
+    def create_light(self, position=(0,0,0), color=None, intensity=1):
+        """Create a point light"""
+        self._ensure_app()
+        from ursina import PointLight, color as colors
+        light = PointLight(
+            position=position,
+            color=color if color is not None else colors.white,
+            intensity=intensity
+        )
+        self.entities.append(light)
+        return light
+
+    def create_camera(self, position=(0,0,0), rotation=(0,0,0)):
+        """Create a camera"""
+        self._ensure_app()
+        from ursina import EditorCamera
+        camera = EditorCamera(
+            position=position,
+            rotation=rotation
+        )
+        self.entities.append(camera)
+        return camera
+
+    def create_fps_controller(self, position=(0,0,0)):
+        """Create a first person controller"""
+        self._ensure_app()
+        from ursina.prefabs.first_person_controller import FirstPersonController
+        player = FirstPersonController(
+            position=position
+        )
+        self.entities.append(player)
+        return player
+
+    def add_physics(self, entity):
+        """Add physics to an entity"""
+        from ursina import RigidBody
+        if not hasattr(entity, 'rigidbody'):
+            entity.add_script(RigidBody())
+
+    def remove_physics(self, entity):
+        """Remove physics from an entity"""
+        if hasattr(entity, 'rigidbody'):
+            entity.remove_script('rigidbody')
 
     def create_advanced_light(self, light_type='point', **kwargs):
         """واجهة موحدة لإنشاء الإضاءة"""
+        self._ensure_app()
         if light_type == 'point':
             return self.light_system.create_point_light(**kwargs)
         elif light_type == 'spot':
@@ -387,9 +744,139 @@ class GameEngine:
         elif light_type == 'ambient':
             return self.light_system.create_ambient_light(**kwargs)
 
+    def create_scene(self, name):
+        """Create a new scene"""
+        self.scenes[name] = []
+        self.current_scene = name
+        return self.scenes[name]
+
+    def add_to_scene(self, scene_name, entity):
+        """Add entity to a scene"""
+        if scene_name in self.scenes:
+            self.scenes[scene_name].append(entity)
+
+    def load_scene(self, scene_name):
+        """Load a scene"""
+        if scene_name in self.scenes:
+            from ursina import destroy
+            # Clear current entities
+            for entity in self.entities:
+                self.physics_system.transform_system.unregister(entity)
+                destroy(entity)
+            self.entities.clear()
+            
+            # Load scene entities
+            self.entities = self.scenes[scene_name]
+            self.current_scene = scene_name
+
+    def save_scene_to_file(self, filename):
+        """Save current scene to file"""
+        scene_data = []
+        for entity in self.entities:
+            entity_data = self._get_entity_state(entity)
+            scene_data.append(entity_data)
+        
+        save_scene_data(filename, scene_data)
+
+    def load_scene_from_file(self, filename):
+        """Load scene from file"""
+        self._ensure_app()
+        from ursina import destroy
+        scene_data = load_scene_data(filename)
+        
+        # Clear existing entities
+        for entity in self.entities:
+            self.physics_system.transform_system.unregister(entity)
+            destroy(entity)
+        self.entities.clear()
+        
+        # Create new entities from loaded data
+        entities_by_id = {}
+        for entity_data in scene_data:
+            entity = self._create_entity_from_state(entity_data)
+            self.entities.append(entity)
+            if entity_data.get('id'):
+                entities_by_id[entity_data['id']] = entity
+
+        # Restore the parent graph once every entity exists
+        for entity_data in scene_data:
+            parent = entities_by_id.get(entity_data.get('parent_id'))
+            if parent is not None:
+                self.physics_system.set_parent(entities_by_id[entity_data['id']], parent)
+
+    def _get_entity_state(self, entity):
+        """Get entity state for saving"""
+        from ursina import scene, color
+        parent = entity.parent if entity.parent and entity.parent != scene else None
+        return {
+            'id': self.physics_system.transform_system.get_stable_id(entity),
+            'parent_id': self.physics_system.transform_system.get_stable_id(parent) if parent else None,
+            'model': entity.model.name if hasattr(entity, 'model') else type(entity).__name__,
+            'position': list(entity.position),
+            'rotation': list(entity.rotation),
+            'scale': list(entity.scale),
+            'color': color.rgb_to_hex(*entity.color),
+            'texture': str(entity.texture) if hasattr(entity, 'texture') else None,
+            'parent': parent.name if parent else None,
+            'has_physics': hasattr(entity, 'rigidbody')
+        }
+
+    def _create_entity_from_state(self, state):
+        """Create entity from saved state"""
+        from ursina import Entity, PointLight, EditorCamera, RigidBody, color
+        from ursina.prefabs.first_person_controller import FirstPersonController
+        if state['model'] in ['PointLight', 'EditorCamera', 'FirstPersonController']:
+            if state['model'] == 'PointLight':
+                entity = PointLight()
+            elif state['model'] == 'EditorCamera':
+                entity = EditorCamera()
+            else:
+                entity = FirstPersonController()
+        else:
+            entity = Entity(model=state['model'])
+        if state.get('id'):
+            entity.stable_id = state['id']
+        
+        entity.position = state['position']
+        entity.rotation = state.get('rotation', (0,0,0))
+        entity.scale = state['scale']
+        entity.color = color.hex(state['color'])
+        if state['texture'] and state['texture'] != 'None':
+            entity.texture = state['texture']
+        if state['has_physics']:
+            entity.add_script(RigidBody())
+        self.physics_system.transform_system.sync(entity)
+        return entity
+
+    def destroy_entity(self, entity):
+        """Destroy an entity and its children, and drop them from the transform cache"""
+        from ursina import destroy
+        if 'physics_system' in self.__dict__:
+            self.physics_system.transform_system.unregister(entity, subtree=True)
+        destroy(entity)
+        # Ursina destroys the children too, so drop every entity that lost its node
+        self.entities = [e for e in self.entities if not e.is_empty()]
+
+    def run(self):
+        """Run the game engine"""
+        self._ensure_app()
+        self.app.run()
+
+    def update(self):
+        """تحديث حالة المحرك (يُستدعى تلقائياً في كل إطار)"""
+        # لا داعي لإنشاء الأنظمة غير المستخدمة بعد
+        if 'physics_system' in self.__dict__:
+            if self.poll_transforms:
+                self.physics_system.transform_system.sync_moved()
+            self.physics_system.transform_system.update()
+        if 'ai_system' in self.__dict__:
+            self.ai_system.update_agents()
+
 
 # مثال على الاستخدام:
 if __name__ == "__main__":
+    from ursina import color
+
     engine = GameEngine()
     
     # إنشاء مشهد
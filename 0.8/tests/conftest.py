@@ -0,0 +1,31 @@
+import importlib.util
+import os
+
+import pytest
+
+ENGINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'game-engine-08.py')
+
+
+@pytest.fixture(scope='session')
+def engine_module():
+    spec = importlib.util.spec_from_file_location('game_engine', ENGINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def ursina_app():
+    """One windowless Ursina app per test session"""
+    ursina = pytest.importorskip('ursina')
+    from panda3d.core import loadPrcFileData
+    loadPrcFileData('', 'audio-library-name null')
+    return ursina.Ursina(window_type='none')
+
+
+class FakeEntity:
+    """Just the transform attributes TransformSystem reads"""
+    def __init__(self, position=(0,0,0), rotation=(0,0,0), scale=(1,1,1)):
+        self.position = position
+        self.rotation = rotation
+        self.scale = scale
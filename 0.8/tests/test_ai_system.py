@@ -0,0 +1,47 @@
+import pytest
+
+ursina = pytest.importorskip('ursina')
+
+from conftest import FakeEntity
+
+
+@pytest.fixture
+def dt(monkeypatch):
+    monkeypatch.setattr(ursina.time, 'dt', 1.0, raising=False)
+
+
+def make_ai(engine_module):
+    return engine_module.AISystem(engine_module.TransformSystem())
+
+
+def test_agents_share_one_transform_pass_per_frame(engine_module, dt, monkeypatch):
+    ai = make_ai(engine_module)
+    ts = ai.transform_system
+    target = FakeEntity(position=ursina.Vec3(10,0,0))
+    for i in range(5):
+        parent = FakeEntity(position=(0,i,0))
+        agent = FakeEntity(position=ursina.Vec3(0,0,0))
+        ts.set_parent(agent, parent)
+        ai.set_target(ai.create_agent(agent, 'follow'), target)
+    ts.update()
+
+    passes = []
+    update = ts.update
+    monkeypatch.setattr(ts, 'update', lambda: (passes.append(1), update()))
+    ai.update_agents()
+    ts.update()
+    assert len(passes) == 1
+
+
+def test_parented_agent_steps_in_parent_space(engine_module, dt):
+    ai = make_ai(engine_module)
+    ts = ai.transform_system
+    parent = FakeEntity(rotation=(0,90,0), scale=(2,2,2))
+    agent = FakeEntity(position=ursina.Vec3(0,0,0))
+    target = FakeEntity(position=ursina.Vec3(10,0,0))
+    ts.set_parent(agent, parent)
+    ai.set_target(ai.create_agent(agent, 'follow'), target)
+
+    ai.update_agents()
+    ts.update()
+    assert tuple(round(v, 6) + 0.0 for v in ts.get_world_matrix(agent)[1]) == (1,0,0)
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+from conftest import ENGINE_PATH
+
+SUBSYSTEMS = ['audio_system', 'ai_system', 'resource_manager', 'physics_system', 'graphics_system', 'light_system']
+
+
+def test_import_does_not_load_ursina():
+    code = (
+        "import importlib.util, sys\n"
+        f"spec = importlib.util.spec_from_file_location('game_engine', {ENGINE_PATH!r})\n"
+        "module = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(module)\n"
+        "module.GameEngine(headless=True).update()\n"
+        "print('ursina' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == 'False'
+
+
+def test_headless_engine_builds_no_subsystems(engine_module):
+    engine = engine_module.GameEngine(headless=True)
+    assert engine.app is None
+    assert not set(SUBSYSTEMS) & set(vars(engine))
+
+
+def test_subsystems_are_built_once_on_first_access(engine_module):
+    engine = engine_module.GameEngine(headless=True)
+    for name in SUBSYSTEMS:
+        subsystem = getattr(engine, name)
+        assert getattr(engine, name) is subsystem
+        assert vars(engine)[name] is subsystem
+
+
+def test_ai_system_shares_the_physics_transform_cache(engine_module):
+    engine = engine_module.GameEngine(headless=True)
+    assert engine.ai_system.transform_system is engine.physics_system.transform_system
+
+
+def test_update_skips_untouched_subsystems(engine_module):
+    engine = engine_module.GameEngine(headless=True)
+    engine.update()
+    assert not set(SUBSYSTEMS) & set(vars(engine))
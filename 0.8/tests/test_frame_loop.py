@@ -0,0 +1,70 @@
+def rounded(values):
+    return tuple(round(v, 6) + 0.0 for v in values)
+
+
+def make_chain(engine):
+    root = engine.create_entity('cube')
+    child = engine.create_entity('cube', position=(0,0,1))
+    engine.physics_system.set_parent(child, root)
+    return root, child
+
+
+def test_frame_loop_applies_direct_parent_moves(engine_module, ursina_app):
+    engine = engine_module.GameEngine()
+    root, child = make_chain(engine)
+    transform_system = engine.physics_system.transform_system
+    ursina_app.step()
+
+    root.position = (5,0,0)
+    root.rotation_y = 90
+    ursina_app.step()
+    # refresh=False: the value must come from the pass the frame loop ran
+    assert rounded(transform_system.get_world_matrix(child, refresh=False)[1]) == (6,0,0)
+    assert rounded(child.world_position) == (6,0,0)
+
+
+def test_property_writes_queue_only_the_moved_entity(engine_module, ursina_app):
+    engine = engine_module.GameEngine()
+    root, child = make_chain(engine)
+    transform_system = engine.physics_system.transform_system
+    transform_system.update()
+
+    child.x = 2
+    assert transform_system._moved == {child.stable_id}
+
+
+def test_reparenting_through_ursina_updates_the_graph(engine_module, ursina_app):
+    engine = engine_module.GameEngine()
+    root, child = make_chain(engine)
+    other = engine.create_entity('cube', position=(0,3,0))
+    engine.physics_system.set_parent(other, root)
+    transform_system = engine.physics_system.transform_system
+
+    child.parent = other
+    assert transform_system.parent_ids[child.stable_id] == other.stable_id
+    assert rounded(transform_system.get_world_position(child)) == (0,3,1)
+
+
+def test_destroyed_entities_do_not_break_the_frame(engine_module, ursina_app):
+    from ursina import destroy
+    engine = engine_module.GameEngine()
+    root, child = make_chain(engine)
+    ursina_app.step()
+
+    destroy(root)
+    ursina_app.step()
+    engine.update()
+
+
+def test_destroy_entity_drops_the_subtree(engine_module, ursina_app):
+    engine = engine_module.GameEngine()
+    root, child = make_chain(engine)
+    other = engine.create_entity('sphere')
+    transform_system = engine.physics_system.transform_system
+    transform_system.register(other)
+
+    engine.destroy_entity(root)
+    ursina_app.step()
+    assert root.stable_id not in transform_system.nodes
+    assert child.stable_id not in transform_system.nodes
+    assert engine.entities == [other]
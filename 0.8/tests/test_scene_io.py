@@ -0,0 +1,33 @@
+def test_save_and_load_round_trips_parent_chain(engine_module, ursina_app, tmp_path):
+    engine = engine_module.GameEngine()
+    root = engine.create_entity('cube', position=(1,0,0))
+    root.rotation_y = 90
+    arm = engine.create_entity('cube', position=(0,0,1))
+    hand = engine.create_entity('sphere', position=(0,1,0))
+    engine.physics_system.set_parent(arm, root)
+    engine.physics_system.set_parent(hand, arm)
+    ids = [engine.physics_system.transform_system.get_stable_id(e) for e in (root, arm, hand)]
+
+    path = tmp_path / 'scene.json'
+    engine.save_scene_to_file(str(path))
+    engine.load_scene_from_file(str(path))
+
+    transform_system = engine.physics_system.transform_system
+    loaded = {entity.stable_id: entity for entity in engine.entities}
+    assert sorted(loaded) == sorted(ids)
+    assert loaded[ids[1]].parent is loaded[ids[0]]
+    assert loaded[ids[2]].parent is loaded[ids[1]]
+    assert transform_system.parent_ids[ids[2]] == ids[1]
+    assert transform_system.parent_ids[ids[1]] == ids[0]
+    assert tuple(round(v, 6) + 0.0 for v in transform_system.get_world_matrix(loaded[ids[2]])[1]) == (2,1,0)
+    assert tuple(round(v, 6) + 0.0 for v in loaded[ids[2]].world_position) == (2,1,0)
+
+
+def test_scene_data_round_trips_without_entities(engine_module, tmp_path):
+    scene_data = [
+        {'id': 'a', 'parent_id': None, 'model': 'cube', 'position': [1,0,0], 'rotation': [0,90,0]},
+        {'id': 'b', 'parent_id': 'a', 'model': 'sphere', 'position': [0,0,1], 'rotation': [0,0,0]},
+    ]
+    path = tmp_path / 'scene.json'
+    engine_module.save_scene_data(str(path), scene_data)
+    assert engine_module.load_scene_data(str(path)) == scene_data
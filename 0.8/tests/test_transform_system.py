@@ -0,0 +1,150 @@
+import pytest
+
+from conftest import FakeEntity
+
+
+def world_position(transform_system, entity):
+    return tuple(round(v, 6) + 0.0 for v in transform_system.get_world_matrix(entity)[1])
+
+
+@pytest.mark.parametrize('rotation, expected', [
+    ((0,90,0), (1,0,0)),    # yaw turns forward to the right
+    ((90,0,0), (0,-1,0)),   # pitch turns forward down
+    ((0,0,90), (0,0,1)),    # roll leaves forward alone
+])
+def test_rotation_matches_ursina_convention(engine_module, rotation, expected):
+    ts = engine_module.TransformSystem()
+    parent, child = FakeEntity(rotation=rotation), FakeEntity(position=(0,0,1))
+    ts.set_parent(child, parent)
+    assert world_position(ts, child) == expected
+
+
+def test_roll_turns_up_to_the_right(engine_module):
+    ts = engine_module.TransformSystem()
+    parent, child = FakeEntity(rotation=(0,0,90)), FakeEntity(position=(0,1,0))
+    ts.set_parent(child, parent)
+    assert world_position(ts, child) == (1,0,0)
+
+
+def test_two_level_chain(engine_module):
+    ts = engine_module.TransformSystem()
+    root = FakeEntity(position=(1,0,0), rotation=(0,90,0))
+    arm = FakeEntity(position=(0,0,1), scale=(2,2,2))
+    hand = FakeEntity(position=(0,1,0))
+    ts.set_parent(arm, root)
+    ts.set_parent(hand, arm)
+    assert world_position(ts, arm) == (2,0,0)
+    assert world_position(ts, hand) == (2,2,0)
+
+
+def test_update_only_recomputes_dirty_subtree(engine_module):
+    ts = engine_module.TransformSystem()
+    root, left, right, leaf = FakeEntity(), FakeEntity(), FakeEntity(), FakeEntity(position=(0,1,0))
+    ts.set_parent(left, root)
+    ts.set_parent(right, root)
+    ts.set_parent(leaf, left)
+    ts.update()
+    right_world = ts.get_world_matrix(right)
+
+    ts.set_local_transform(left, position=(5,0,0))
+    ts.update()
+    assert ts.get_world_matrix(right) is right_world
+    assert world_position(ts, leaf) == (5,1,0)
+
+
+def test_unregister_reorders_by_depth(engine_module):
+    ts = engine_module.TransformSystem()
+    a, b, c, d = FakeEntity(position=(1,0,0)), FakeEntity(position=(1,0,0)), FakeEntity(position=(1,0,0)), FakeEntity(position=(1,0,0))
+    ts.set_parent(b, a)
+    ts.set_parent(c, b)
+    ts.set_parent(d, c)
+    ts.update()
+
+    ts.unregister(b)
+    ts.update()
+    depths = dict(zip(ts._ids, ts._depths))
+    assert depths[c.stable_id] == 0
+    assert depths[d.stable_id] == 1
+    assert ts._ids.index(c.stable_id) < ts._ids.index(d.stable_id)
+    assert world_position(ts, d) == (2,0,0)
+
+
+def test_set_parent_rejects_cycles(engine_module):
+    ts = engine_module.TransformSystem()
+    a, b, c = FakeEntity(), FakeEntity(), FakeEntity()
+    ts.set_parent(b, a)
+    ts.set_parent(c, b)
+    with pytest.raises(ValueError):
+        ts.set_parent(a, c)
+    with pytest.raises(ValueError):
+        ts.set_parent(a, a)
+
+
+def test_sync_moved_picks_up_direct_writes(engine_module):
+    ts = engine_module.TransformSystem()
+    root, child = FakeEntity(), FakeEntity(position=(0,0,1))
+    ts.set_parent(child, root)
+    ts.update()
+
+    root.position = (9,9,9)
+    ts.sync_moved()
+    ts.update()
+    assert world_position(ts, child) == (9,9,10)
+
+
+def test_world_to_local_vector_undoes_parent_rotation_and_scale(engine_module):
+    ts = engine_module.TransformSystem()
+    parent, child = FakeEntity(rotation=(0,90,0), scale=(2,2,2)), FakeEntity()
+    ts.set_parent(child, parent)
+    local = ts.world_to_local_vector(child, (1,0,0))
+    assert tuple(round(v, 6) + 0.0 for v in local) == (0,0,0.5)
+
+
+def test_idle_update_does_not_read_entities(engine_module, monkeypatch):
+    ts = engine_module.TransformSystem()
+    root, child = FakeEntity(), FakeEntity(position=(0,0,1))
+    ts.set_parent(child, root)
+    ts.update()
+
+    def fail(entity):
+        raise AssertionError('update() read an entity that did not move')
+    monkeypatch.setattr(engine_module, '_read_local', fail)
+    ts.update()
+    ts.get_world_matrix(child)
+
+
+def test_mark_moved_is_applied_in_the_next_update(engine_module):
+    ts = engine_module.TransformSystem()
+    root, child = FakeEntity(), FakeEntity(position=(0,0,1))
+    ts.set_parent(child, root)
+    ts.update()
+
+    root.position = (3,0,0)
+    ts.mark_moved(root)
+    assert world_position(ts, child) == (3,0,1)
+
+
+def test_removed_entities_are_dropped_with_their_subtree(engine_module):
+    ts = engine_module.TransformSystem()
+    root, child, other = FakeEntity(), FakeEntity(), FakeEntity()
+    ts.set_parent(child, root)
+    ts.register(other)
+    ts.update()
+
+    root.is_empty = lambda: True
+    ts.mark_moved(root)
+    ts.update()
+    assert set(ts.nodes) == {other.stable_id}
+    assert ts._ids == [other.stable_id]
+
+
+def test_unregister_subtree(engine_module):
+    ts = engine_module.TransformSystem()
+    a, b, c, d = FakeEntity(), FakeEntity(), FakeEntity(), FakeEntity()
+    ts.set_parent(b, a)
+    ts.set_parent(c, b)
+    ts.set_parent(d, a)
+    ts.unregister(b, subtree=True)
+    assert set(ts.nodes) == {a.stable_id, d.stable_id}
+    ts.update()
+    assert ts._ids[0] == a.stable_id